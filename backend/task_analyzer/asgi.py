@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_analyzer.settings')
 
 application = get_asgi_application()
+
+# Compile the optional Numba scoring kernel once per server process, here
+# rather than in AppConfig.ready() so management commands skip it
+from tasks import _kernels  # noqa: E402
+
+_kernels.warm_up()
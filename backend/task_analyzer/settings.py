@@ -77,6 +77,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'task_analyzer.wsgi.application'
+ASGI_APPLICATION = 'task_analyzer.asgi.application'
 
 
 # Database
@@ -144,3 +145,16 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = DEBUG  # Only allow all in development
 CORS_ALLOWED_ORIGINS = os.getenv('CORS_ALLOWED_ORIGINS', '').split(',') if not DEBUG else []
+
+# Task scoring: batches with more tasks than this are scored in a process
+# pool. 0 keeps scoring in the request thread.
+SCORING_PARALLEL_THRESHOLD = int(os.getenv('SCORING_PARALLEL_THRESHOLD', '0'))
+# 'piecewise' (fixed per-task curves) or 'minmax' (rescaled across the batch)
+SCORING_NORMALIZATION = os.getenv('SCORING_NORMALIZATION', 'piecewise')
+
+# Request limits for the task endpoints: larger bodies or batches get a 413
+# before any parsing or scoring work. Django's own body cap follows the byte
+# limit so it does not reject payloads first.
+MAX_ANALYZE_BYTES = int(os.getenv('MAX_ANALYZE_BYTES', str(4 * 1024 * 1024)))
+MAX_TASKS = int(os.getenv('MAX_TASKS', '10000'))
+DATA_UPLOAD_MAX_MEMORY_SIZE = MAX_ANALYZE_BYTES
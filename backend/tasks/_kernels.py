@@ -0,0 +1,161 @@
+"""
+Batch scoring kernels used by TaskScorer for batches of at least
+vectorize_threshold tasks, and always by score_and_sort_tasks_vectorized.
+
+compute_scores takes column arrays for a batch of tasks and returns an
+(N, 5) float64 array of urgency, importance, effort, dependency and final
+scores, following the same rules as the scalar TaskScorer methods.
+
+Day offsets and dependent counts are passed as int32 and the business-day
+table is int8 to keep the integer columns narrow. Hours, importance and
+the sub-scores stay float64 because the sub-scores are fractional (e.g.
+62.5 effort) and must match the scalar path exactly. TaskScorer rejects
+non-numeric hours and importance before building the columns, so the
+kernel never sees values the scalar path would not accept.
+
+Numba is an optional dependency. When it is installed the kernel is
+JIT-compiled (and cached on disk), and the WSGI/ASGI entry points call
+warm_up() at server start; otherwise an equivalent NumPy implementation
+is selected at import time.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(**kwargs):
+        return lambda f: f
+
+
+# BUSINESS_DAYS_REM[weekday, n]: business days among n consecutive days
+# starting on the given weekday (n < 7)
+BUSINESS_DAYS_REM = np.array([
+    [sum(1 for i in range(n) if (wd + i) % 7 < 5) for n in range(7)]
+    for wd in range(7)
+], dtype=np.int8)
+
+
+# fastmath is deliberately left off: reassociating the weighted sum changes
+# the last bits of the result, which is enough to flip the 2-decimal
+# rounding and make batch results differ from the scalar path.
+@njit(cache=True, parallel=True)
+def _compute_scores_jit(due_days, valid, hours, importance, dep_counts,
+                        weights, today_weekday):
+    n = due_days.shape[0]
+    out = np.empty((n, 5), dtype=np.float64)
+    for i in prange(n):
+        days = due_days[i]
+
+        # Urgency
+        if not valid[i]:
+            urgency = 50.0
+        elif days < 0:
+            urgency = 100.0 + min(-days * 5, 100)
+        else:
+            full_weeks = (days + 1) // 7
+            business_days = (full_weeks * 5 +
+                             BUSINESS_DAYS_REM[today_weekday, (days + 1) % 7])
+            penalty = 5 * ((today_weekday + days) % 7 >= 5)
+            if days <= 1:
+                urgency = 95.0 - penalty
+            elif days <= 7:
+                if business_days <= 3:
+                    urgency = 90.0 - penalty
+                else:
+                    urgency = 85.0 - (business_days * 2) - penalty
+            elif days <= 14:
+                urgency = 70.0 - (business_days - 5) * 2 - penalty
+            elif days <= 30:
+                urgency = max(50 - (business_days - 10) * 1.5, 20) - penalty
+            else:
+                urgency = max(20 - (days - 30) * 0.5, 5)
+
+        # Effort
+        h = hours[i]
+        if h <= 0:
+            effort = 50.0
+        elif h < 2:
+            effort = 90.0
+        elif h <= 8:
+            effort = 70 - (h - 2) * 5
+        else:
+            effort = max(30 - (h - 8) * 2, 10)
+
+        # Importance
+        importance_score = min(max(importance[i], 1.0), 10.0) * 10
+
+        # Dependencies
+        count = dep_counts[i]
+        if count == 0:
+            dependency = 30.0
+        else:
+            dependency = min(30.0 + count * 25, 100.0)
+
+        out[i, 0] = urgency
+        out[i, 1] = importance_score
+        out[i, 2] = effort
+        out[i, 3] = dependency
+        out[i, 4] = (urgency * weights[0] + importance_score * weights[1] +
+                     effort * weights[2] + dependency * weights[3])
+    return out
+
+
+def _compute_scores_numpy(due_days, valid, hours, importance, dep_counts,
+                          weights, today_weekday):
+    full_weeks, remainder = np.divmod(np.maximum(due_days + 1, 0), 7)
+    business_days = full_weeks * 5 + BUSINESS_DAYS_REM[today_weekday, remainder]
+    penalty = 5 * ((today_weekday + due_days) % 7 >= 5)
+
+    urgency = np.select(
+        [
+            due_days < 0,
+            due_days <= 1,
+            (due_days <= 7) & (business_days <= 3),
+            due_days <= 7,
+            due_days <= 14,
+            due_days <= 30,
+        ],
+        [
+            100 + np.minimum(-due_days * 5, 100),
+            95 - penalty,
+            90 - penalty,
+            85 - (business_days * 2) - penalty,
+            70 - (business_days - 5) * 2 - penalty,
+            np.maximum(50 - (business_days - 10) * 1.5, 20) - penalty,
+        ],
+        default=np.maximum(20 - (due_days - 30) * 0.5, 5),
+    )
+    urgency = np.where(valid, urgency, 50)
+
+    effort = np.select(
+        [hours <= 0, hours < 2, hours <= 8],
+        [50, 90, 70 - (hours - 2) * 5],
+        default=np.maximum(30 - (hours - 8) * 2, 10),
+    )
+    importance_score = np.clip(importance, 1, 10) * 10
+    dependency = np.where(dep_counts == 0, 30, np.minimum(30 + dep_counts * 25, 100))
+
+    final = (urgency * weights[0] + importance_score * weights[1] +
+             effort * weights[2] + dependency * weights[3])
+    return np.column_stack([urgency, importance_score, effort, dependency, final]).astype(np.float64)
+
+
+compute_scores = _compute_scores_jit if HAVE_NUMBA else _compute_scores_numpy
+
+
+def warm_up():
+    """
+    Compile the Numba kernel (or load it from the on-disk cache) with the
+    argument types TaskScorer passes, so the first large request does not
+    pay for JIT compilation. A no-op without Numba.
+    """
+    if HAVE_NUMBA:
+        compute_scores(
+            np.zeros(1, dtype=np.int32), np.ones(1, dtype=np.bool_),
+            np.ones(1), np.ones(1), np.zeros(1, dtype=np.int32),
+            np.ones(4), 0,
+        )
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
+
+    def ready(self):
+        from django.conf import settings
+        from django.core.exceptions import ImproperlyConfigured
+        from .scoring import TaskScorer
+
+        # Fail at startup rather than with a 500 on every scoring request
+        if settings.SCORING_NORMALIZATION not in TaskScorer.normalizations:
+            raise ImproperlyConfigured(
+                f"SCORING_NORMALIZATION must be one of "
+                f"{', '.join(TaskScorer.normalizations)}, "
+                f"not {settings.SCORING_NORMALIZATION!r}"
+            )
@@ -1,6 +1,13 @@
-from django.test import TestCase
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.test import Client, TestCase
+from collections import Counter
+from unittest import mock
 from datetime import date, timedelta
-from .scoring import TaskScorer
+import orjson
+from . import scoring, views
+from .scoring import TaskScorer, TaskValidationError, get_scorer
+from .views import generate_explanation
 
 
 class TaskScorerTestCase(TestCase):
@@ -10,6 +17,26 @@ class TaskScorerTestCase(TestCase):
         self.scorer = TaskScorer(strategy='smart_balance')
         self.today = date.today()
     
+    def make_tasks(self, n, *extra):
+        """
+        n tasks with a spread of due dates, efforts, importances and
+        dependencies, followed by copies of any extra tasks. Each call
+        returns fresh dicts, since scoring writes into them.
+        """
+        tasks = [
+            {
+                'id': str(i),
+                'title': f'Task {i}',
+                'due_date': (self.today + timedelta(days=i % 50 - 10)).isoformat(),
+                'estimated_hours': [0, 1, 3.5, 8, 12, 30][i % 6],
+                'importance': i % 12 - 1,
+                'dependencies': [str(i // 3)] if i else []
+            }
+            for i in range(n)
+        ]
+        tasks.extend(dict(t) for t in extra)
+        return tasks
+    
     def test_urgency_score_past_due(self):
         """Test that past due tasks get maximum urgency"""
         past_date = (self.today - timedelta(days=5)).isoformat()
@@ -64,6 +91,20 @@ class TaskScorerTestCase(TestCase):
         score = self.scorer.calculate_dependency_score('1', tasks)
         self.assertGreater(score, 50, "Tasks blocking others should get higher scores")
     
+    def test_dependency_score_from_precomputed_counts(self):
+        """Test that precomputed dependent counts give the same score as a scan"""
+        tasks = [
+            {'id': '1', 'dependencies': []},
+            {'id': '2', 'dependencies': ['1']},
+            {'id': '3', 'dependencies': ['1', '2']}
+        ]
+        dep_counts = Counter({'1': 2, '2': 1})
+        for task_id in ('1', '2', '3'):
+            self.assertEqual(
+                self.scorer.calculate_dependency_score(task_id, tasks, dep_counts),
+                self.scorer.calculate_dependency_score(task_id, tasks)
+            )
+    
     def test_circular_dependency_detection(self):
         """Test that circular dependencies are detected"""
         tasks = [
@@ -84,6 +125,50 @@ class TaskScorerTestCase(TestCase):
         circular = self.scorer.detect_circular_dependencies(tasks)
         self.assertEqual(len(circular), 0, "Valid chains should not be flagged")
     
+    def test_circular_dependency_excludes_upstream_tasks(self):
+        """Test that a task depending on a cycle is not itself flagged"""
+        tasks = [
+            {'id': '0', 'dependencies': ['1']},
+            {'id': '1', 'dependencies': ['2']},
+            {'id': '2', 'dependencies': ['1']}
+        ]
+        circular = self.scorer.detect_circular_dependencies(tasks)
+        self.assertEqual(circular, {'1', '2'})
+    
+    def test_circular_dependency_overlapping_cycles(self):
+        """Test that every member of overlapping cycles is flagged"""
+        tasks = [
+            {'id': 'A', 'dependencies': ['B', 'D']},
+            {'id': 'B', 'dependencies': ['C']},
+            {'id': 'C', 'dependencies': ['A']},
+            {'id': 'D', 'dependencies': ['B']},
+            {'id': 'E', 'dependencies': ['E']},
+            {'id': 'F', 'dependencies': ['A']}
+        ]
+        circular = self.scorer.detect_circular_dependencies(tasks)
+        self.assertEqual(circular, {'A', 'B', 'C', 'D', 'E'})
+    
+    def test_has_any_cycle(self):
+        """Test the existence-only cycle check"""
+        chain = [
+            {'id': '1', 'dependencies': []},
+            {'id': '2', 'dependencies': ['1', 'missing']},
+            {'id': '3', 'dependencies': ['2', '1']}
+        ]
+        self.assertFalse(self.scorer.has_any_cycle(chain))
+        
+        chain[0]['dependencies'] = ['3']
+        self.assertTrue(self.scorer.has_any_cycle(chain))
+        self.assertTrue(self.scorer.has_any_cycle([{'id': 'x', 'dependencies': ['x']}]))
+    
+    def test_circular_dependency_deep_chain(self):
+        """Test that very long chains do not hit the recursion limit"""
+        tasks = [{'id': str(i), 'dependencies': [str(i + 1)]} for i in range(5000)]
+        self.assertEqual(len(self.scorer.detect_circular_dependencies(tasks)), 0)
+        
+        tasks.append({'id': '5000', 'dependencies': ['0']})
+        self.assertEqual(len(self.scorer.detect_circular_dependencies(tasks)), 5001)
+    
     def test_calculate_priority_score(self):
         """Test that priority score is calculated correctly"""
         tasks = [
@@ -129,6 +214,34 @@ class TaskScorerTestCase(TestCase):
             sorted_tasks[1]['priority_score']
         )
     
+    def test_score_and_sort_tasks_in_place(self):
+        """Test that scoring sorts the given list and reuses its dicts"""
+        low = {'id': '1', 'title': 'Low', 'importance': 1}
+        high = {'id': '2', 'title': 'High', 'importance': 10}
+        tasks = [low, high]
+        sorted_tasks = self.scorer.score_and_sort_tasks(tasks)
+        self.assertIs(sorted_tasks, tasks)
+        self.assertIs(tasks[0], high)
+        self.assertIn('score_breakdown', low)
+    
+    def test_top_k_tasks(self):
+        """Test that top_k_tasks returns the head of the full ranking"""
+        full = self.scorer.score_and_sort_tasks(self.make_tasks(10))
+        top = self.scorer.top_k_tasks(self.make_tasks(10), 3)
+        self.assertEqual([t['id'] for t in top], [t['id'] for t in full[:3]])
+    
+    def test_parallel_scoring_matches_serial(self):
+        """Test that process-pool scoring gives the same result as serial"""
+        serial = self.scorer.score_and_sort_tasks(self.make_tasks(200))
+        scorer = TaskScorer(parallel_threshold=50)
+        parallel = scorer.score_and_sort_tasks(self.make_tasks(200))
+        self.assertEqual(serial, parallel)
+        
+        # The pool is started once and reused by later batches
+        pool = scoring._scoring_pool()
+        self.assertEqual(scorer.score_and_sort_tasks(self.make_tasks(200)), serial)
+        self.assertIs(scoring._scoring_pool(), pool)
+    
     def test_strategy_fastest_wins(self):
         """Test that fastest_wins strategy prioritizes low effort"""
         scorer = TaskScorer(strategy='fastest_wins')
@@ -144,6 +257,13 @@ class TaskScorerTestCase(TestCase):
         scorer = TaskScorer(strategy='deadline_driven')
         self.assertEqual(scorer.weights['urgency'], 0.60)
     
+    def test_get_scorer_reuses_instance_per_strategy(self):
+        """Test that get_scorer shares one scorer per strategy"""
+        scorer = get_scorer('high_impact')
+        self.assertIs(get_scorer('high_impact'), scorer)
+        self.assertIsNot(get_scorer('fastest_wins'), scorer)
+        self.assertEqual(scorer.weights['importance'], 0.60)
+    
     def test_missing_data_handling(self):
         """Test that missing or invalid data is handled gracefully"""
         tasks = [
@@ -158,6 +278,24 @@ class TaskScorerTestCase(TestCase):
         self.assertGreater(result['priority_score'], 0)
 
 
+    def test_missing_id_assigned_once(self):
+        """Test that tasks without an id get one stored on the task"""
+        tasks = [{'title': 'No id', 'due_date': self.today.isoformat()}]
+        result = self.scorer.score_and_sort_tasks(tasks)
+        self.assertEqual(result[0]['id'], str(hash('No id')))
+    
+    def test_validate_missing_title(self):
+        """Test that validation reports the first task without a title"""
+        tasks = [
+            {'id': '1', 'title': 'Has title'},
+            {'id': '2', 'title': ''},
+            {'id': '3'}
+        ]
+        with self.assertRaises(TaskValidationError) as ctx:
+            self.scorer.score_and_sort_tasks(tasks, validate=True)
+        self.assertEqual(ctx.exception.index, 1)
+        self.assertEqual(str(ctx.exception), 'Task at index 1 missing title')
+    
     def test_weekend_detection(self):
         """Test that weekends are correctly detected"""
         # Saturday
@@ -186,6 +324,18 @@ class TaskScorerTestCase(TestCase):
         business_days = self.scorer.count_business_days(start, end)
         self.assertEqual(business_days, 6)  # Mon-Fri + Mon
     
+    def test_business_days_matches_day_by_day_count(self):
+        """Test the closed-form business day count against a direct count"""
+        for start_offset in range(7):
+            start = date(2025, 12, 1) + timedelta(days=start_offset)
+            for span in range(-3, 60):
+                end = start + timedelta(days=span)
+                expected = sum(
+                    1 for i in range(span + 1)
+                    if not self.scorer.is_weekend(start + timedelta(days=i))
+                )
+                self.assertEqual(self.scorer.count_business_days(start, end), expected)
+    
     def test_weekend_urgency_adjustment(self):
         """Test that tasks due on weekends have adjusted urgency"""
         # Find next Saturday
@@ -209,3 +359,199 @@ class TaskScorerTestCase(TestCase):
         self.assertIsInstance(thursday_score, (int, float))
         self.assertGreater(saturday_score, 0)
         self.assertGreater(thursday_score, 0)
+    
+    def test_urgency_table_matches_ladder(self):
+        """Test that the urgency lookup table agrees with the full ladder"""
+        # -500..900 covers the whole table plus offsets well past both ends
+        self.assertLess(-500, scoring._LUT_MIN_DAYS)
+        self.assertGreater(900, scoring._LUT_MAX_DAYS)
+        for today_weekday in range(7):
+            for days in range(-500, 901):
+                self.assertEqual(
+                    scoring._urgency_for_days(days, today_weekday),
+                    scoring._urgency_for_offset(days, today_weekday),
+                    (days, today_weekday)
+                )
+    
+    def test_vectorized_matches_scalar_scoring(self):
+        """Test that the NumPy path produces the same scores and order"""
+        extra = ({'id': 'bad', 'title': 'Bad date', 'due_date': 'not-a-date'},
+                 {'id': 'missing', 'title': 'Missing fields'})
+        
+        scalar = self.scorer.score_and_sort_tasks(self.make_tasks(30, *extra))
+        self.assertLess(len(scalar), self.scorer.vectorize_threshold)
+        vectorized = self.scorer.score_and_sort_tasks_vectorized(self.make_tasks(30, *extra))
+        self.assertEqual(
+            [(t['id'], t['score_breakdown']) for t in scalar],
+            [(t['id'], t['score_breakdown']) for t in vectorized]
+        )
+    
+    def test_large_batches_use_vectorized_path(self):
+        """Test that batches over the threshold score like the scalar path"""
+        n = self.scorer.vectorize_threshold + 20
+        batched = self.scorer.score_and_sort_tasks(self.make_tasks(n))
+        
+        scalar_scorer = TaskScorer()
+        scalar_scorer.vectorize_threshold = n + 1
+        scalar = scalar_scorer.score_and_sort_tasks(self.make_tasks(n))
+        self.assertEqual(batched, scalar)
+        for result in (batched, scalar):
+            for task in result:
+                self.assertTrue(all(
+                    type(value) is float for value in task['score_breakdown'].values()
+                ))
+    
+    def test_malformed_numbers_rejected_at_any_batch_size(self):
+        """Test that bad hours or importance fail the same way on both paths"""
+        for bad in ({'estimated_hours': None}, {'estimated_hours': '8'},
+                    {'importance': '8'}, {'importance': None}):
+            for n in (5, 150):
+                tasks = [{'id': str(i), 'title': f'Task {i}'} for i in range(n)]
+                tasks[3].update(bad)
+                with self.assertRaises(TaskValidationError) as ctx:
+                    self.scorer.score_and_sort_tasks(tasks)
+                self.assertEqual(ctx.exception.index, 3)
+    
+    def test_minmax_normalization(self):
+        """Test that minmax rescales each criterion across the batch"""
+        scorer = TaskScorer(normalization='minmax')
+        tasks = [
+            {'id': '1', 'title': 'Soon, quick', 'importance': 2,
+             'due_date': self.today.isoformat(), 'estimated_hours': 1,
+             'dependencies': []},
+            {'id': '2', 'title': 'Later, long', 'importance': 10,
+             'due_date': (self.today + timedelta(days=10)).isoformat(),
+             'estimated_hours': 9, 'dependencies': ['1']},
+            {'id': '3', 'title': 'No date', 'importance': 6,
+             'due_date': 'not-a-date', 'estimated_hours': 5,
+             'dependencies': []},
+        ]
+        scored = {t['id']: t['score_breakdown'] for t in scorer.score_and_sort_tasks(tasks)}
+        
+        self.assertAlmostEqual(scored['1']['urgency'], 100)
+        self.assertAlmostEqual(scored['2']['urgency'], 0)
+        self.assertEqual(scored['3']['urgency'], 50)
+        self.assertAlmostEqual(scored['1']['effort'], 100)
+        self.assertAlmostEqual(scored['3']['effort'], 50)
+        self.assertAlmostEqual(scored['2']['importance'], 100)
+        self.assertAlmostEqual(scored['1']['dependencies'], 100)
+        
+        with self.assertRaises(ValueError):
+            TaskScorer(normalization='zscore')
+        
+        # A misconfigured setting is caught when the app starts
+        with self.settings(SCORING_NORMALIZATION='zscore'):
+            with self.assertRaises(ImproperlyConfigured):
+                apps.get_app_config('tasks').ready()
+
+
+class TaskApiTestCase(TestCase):
+    """Request handling for the analyze and suggest endpoints"""
+    
+    urls = ('/api/tasks/analyze/', '/api/tasks/suggest/')
+    
+    def post(self, url, tasks):
+        return self.client.post(url, orjson.dumps({'tasks': tasks}),
+                                content_type='application/json')
+    
+    def test_oversized_body_rejected(self):
+        """Test that a body over MAX_ANALYZE_BYTES gets a 413"""
+        tasks = [{'id': str(i), 'title': f'Task {i}'} for i in range(5)]
+        with self.settings(MAX_ANALYZE_BYTES=64):
+            for url in self.urls:
+                response = self.post(url, tasks)
+                self.assertEqual(response.status_code, 413)
+                self.assertEqual(response.json(), {'error': 'Payload too large'})
+    
+    def test_too_many_tasks_rejected(self):
+        """Test that more than MAX_TASKS tasks gets a 413"""
+        tasks = [{'id': str(i), 'title': f'Task {i}'} for i in range(3)]
+        with self.settings(MAX_TASKS=2):
+            for url in self.urls:
+                response = self.post(url, tasks)
+                self.assertEqual(response.status_code, 413)
+                self.assertEqual(response.json(), {'error': 'Too many tasks (limit 2)'})
+        with self.settings(MAX_TASKS=3):
+            for url in self.urls:
+                self.assertEqual(self.post(url, tasks).status_code, 200)
+    
+    def test_null_tasks_rejected(self):
+        """Test that a null task list gets a 400, not a 500"""
+        for url in self.urls:
+            response = self.post(url, None)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {'error': 'No tasks provided'})
+    
+    def test_unknown_strategy_falls_back(self):
+        """Test that an unknown strategy scores as smart_balance"""
+        tasks = [{'id': '1', 'title': 'Task 1'}]
+        get_scorer.cache_clear()
+        for url in self.urls:
+            for strategy in ('no_such_strategy', ['high_impact'], None):
+                response = self.client.post(
+                    url, orjson.dumps({'tasks': tasks, 'strategy': strategy}),
+                    content_type='application/json')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['strategy'], 'smart_balance')
+        # Junk values never got a scorer of their own
+        self.assertEqual(get_scorer.cache_info().currsize, 1)
+    
+    def test_endpoints_only_accept_post(self):
+        """Test that GET is refused with 405 and an Allow header"""
+        for url in self.urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 405)
+            self.assertEqual(response['Allow'], 'POST')
+    
+    def test_endpoints_are_csrf_exempt(self):
+        """Test that POST works without a CSRF token"""
+        self.client = Client(enforce_csrf_checks=True)
+        tasks = [{'id': '1', 'title': 'Task 1'}]
+        for url in self.urls:
+            self.assertEqual(self.post(url, tasks).status_code, 200)
+
+
+class GenerateExplanationTestCase(TestCase):
+    """Explanation text for suggested tasks"""
+    
+    def explain(self, rank=1, circular=False, **breakdown):
+        task = {'priority_score': 61.5, 'score_breakdown': breakdown}
+        if circular:
+            task['has_circular_dependency'] = True
+        return generate_explanation(task, rank)
+    
+    def test_reasons_in_order(self):
+        """Test that every matching reason is listed in table order"""
+        self.assertEqual(
+            self.explain(2, circular=True, urgency=90, importance=80,
+                         effort=90, dependencies=55),
+            "Ranked #2: Due very soon or overdue, marked as highly important, "
+            "quick win (low effort), blocks other tasks, "
+            "⚠️ has circular dependency issue. Score: 61.5"
+        )
+    
+    def test_urgency_bands_are_exclusive(self):
+        """Test that only one urgency reason applies, with strict bounds"""
+        self.assertEqual(self.explain(urgency=85.5),
+                         "Ranked #1: Due very soon or overdue. Score: 61.5")
+        self.assertEqual(self.explain(urgency=85),
+                         "Ranked #1: Approaching deadline. Score: 61.5")
+        self.assertEqual(self.explain(urgency=70),
+                         "Ranked #1: Good balance of all factors. Score: 61.5")
+    
+    def test_importance_threshold_is_inclusive(self):
+        """Test that importance of exactly 80 counts, just below does not"""
+        self.assertEqual(self.explain(importance=80),
+                         "Ranked #1: Marked as highly important. Score: 61.5")
+        self.assertEqual(self.explain(importance=79.9),
+                         "Ranked #1: Good balance of all factors. Score: 61.5")
+    
+    def test_only_first_letter_capitalized(self):
+        """Test that capitals later in the sentence are kept"""
+        table = (('urgency', 50, "due before the Q3 release"),
+                 ('effort', 50, "fits in one PR"))
+        with mock.patch.object(views, '_REASON_TABLE', table):
+            self.assertEqual(
+                self.explain(urgency=60, effort=60),
+                "Ranked #1: Due before the Q3 release, fits in one PR. Score: 61.5"
+            )
@@ -1,77 +1,163 @@
-from django.http import JsonResponse
-from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
-import json
-from .scoring import TaskScorer
-
-@csrf_exempt
-@require_http_methods(["POST"])
-def analyze_tasks(request):
+import asyncio
+from functools import wraps
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotAllowed
+import math
+import orjson
+from .scoring import STRATEGY_WEIGHTS, TaskValidationError, get_scorer
+
+
+# (breakdown key, threshold, reason): a reason applies when the score is
+# above its threshold. Rows are checked in order and each key gives at most
+# one reason, so the two urgency bands behave like an if/elif.
+_REASON_TABLE = (
+    ('urgency', 85, "due very soon or overdue"),
+    ('urgency', 70, "approaching deadline"),
+    # Importance counts from 80 inclusive: the largest float below 80
+    ('importance', math.nextafter(80, 0), "marked as highly important"),
+    ('effort', 80, "quick win (low effort)"),
+    ('dependencies', 50, "blocks other tasks"),
+)
+
+
+def _json_response(payload, status=200) -> HttpResponse:
+    """JSON response serialized with orjson (C speed, emits bytes directly)."""
+    return HttpResponse(orjson.dumps(payload), status=status,
+                        content_type='application/json')
+
+
+def _async_post_view(view):
+    """
+    csrf_exempt plus require_http_methods(["POST"]) for async views. The
+    Django 4.x decorators wrap views in sync functions, which would hide the
+    coroutine from Django's async handler.
+    """
+    @wraps(view)
+    async def inner(request, *args, **kwargs):
+        if request.method != 'POST':
+            return HttpResponseNotAllowed(['POST'])
+        return await view(request, *args, **kwargs)
+    
+    inner.csrf_exempt = True
+    return inner
+
+
+def _body_too_large(request) -> bool:
+    """
+    True if the request body exceeds MAX_ANALYZE_BYTES. The declared
+    Content-Length is checked before request.body is touched, so an
+    oversized body is never loaded into memory as one bytes object. Under
+    ASGI the handler has already received the body by now, spooled to disk
+    once it passes FILE_UPLOAD_MAX_MEMORY_SIZE.
+    """
+    try:
+        declared = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        declared = 0
+    limit = settings.MAX_ANALYZE_BYTES
+    return declared > limit or len(request.body) > limit
+
+
+class _PayloadTooLarge(Exception):
+    """A task request is over MAX_ANALYZE_BYTES or MAX_TASKS (answered 413)."""
+
+
+def _load_payload(request) -> dict:
+    """
+    Parse a task request's JSON body, enforcing the size limits: the byte
+    limit before parsing and the task limit right after it.
+    """
+    if _body_too_large(request):
+        raise _PayloadTooLarge('Payload too large')
+    data = orjson.loads(request.body)
+    if len(data.get('tasks') or ()) > settings.MAX_TASKS:
+        raise _PayloadTooLarge(f'Too many tasks (limit {settings.MAX_TASKS})')
+    return data
+
+
+def _requested_strategy(data: dict) -> str:
+    """
+    The scoring strategy a request asks for, falling back to smart_balance
+    for unknown values so they don't take a slot in get_scorer's cache.
+    """
+    strategy = data.get('strategy', 'smart_balance')
+    if isinstance(strategy, str) and strategy in STRATEGY_WEIGHTS:
+        return strategy
+    return 'smart_balance'
+
+
+@_async_post_view
+async def analyze_tasks(request):
     """
     POST /api/tasks/analyze/
     Accept list of tasks and return them sorted by priority score.
     """
     try:
-        data = json.loads(request.body)
+        data = _load_payload(request)
         tasks = data.get('tasks', [])
-        strategy = data.get('strategy', 'smart_balance')
+        strategy = _requested_strategy(data)
         
         if not tasks:
-            return JsonResponse({
+            return _json_response({
                 'error': 'No tasks provided'
             }, status=400)
         
-        # Validate tasks
-        for i, task in enumerate(tasks):
-            if not task.get('title'):
-                return JsonResponse({
-                    'error': f'Task at index {i} missing title'
-                }, status=400)
+        # Score and sort tasks; titles are validated in the same pass
+        scorer = get_scorer(strategy, settings.SCORING_PARALLEL_THRESHOLD,
+                            settings.SCORING_NORMALIZATION)
+        # Scoring is CPU-bound, so it runs in a worker thread and keeps the
+        # event loop free for other requests
+        sorted_tasks = await asyncio.to_thread(_score_and_round, scorer, tasks)
         
-        # Score and sort tasks
-        scorer = TaskScorer(strategy=strategy)
-        sorted_tasks = scorer.score_and_sort_tasks(tasks)
-        
-        return JsonResponse({
+        return _json_response({
             'tasks': sorted_tasks,
             'strategy': strategy,
             'total_count': len(sorted_tasks)
         })
         
-    except json.JSONDecodeError:
-        return JsonResponse({
+    except _PayloadTooLarge as e:
+        return _json_response({
+            'error': str(e)
+        }, status=413)
+    except orjson.JSONDecodeError:
+        return _json_response({
             'error': 'Invalid JSON format'
         }, status=400)
+    except TaskValidationError as e:
+        return _json_response({
+            'error': str(e)
+        }, status=400)
     except Exception as e:
-        return JsonResponse({
+        return _json_response({
             'error': str(e)
         }, status=500)
 
 
-@csrf_exempt
-@require_http_methods(["POST"])
-def suggest_tasks(request):
+@_async_post_view
+async def suggest_tasks(request):
     """
     POST /api/tasks/suggest/
     Return top 3 tasks with explanations.
     """
     try:
-        data = json.loads(request.body)
+        data = _load_payload(request)
         tasks = data.get('tasks', [])
-        strategy = data.get('strategy', 'smart_balance')
+        strategy = _requested_strategy(data)
         
         if not tasks:
-            return JsonResponse({
+            return _json_response({
                 'error': 'No tasks provided'
             }, status=400)
         
-        # Score and sort tasks
-        scorer = TaskScorer(strategy=strategy)
-        sorted_tasks = scorer.score_and_sort_tasks(tasks)
+        # Score all tasks but only rank the top 3 (heap, no full sort)
+        scorer = get_scorer(strategy, settings.SCORING_PARALLEL_THRESHOLD,
+                            settings.SCORING_NORMALIZATION)
+        top_tasks = await asyncio.to_thread(scorer.top_k_tasks, tasks, 3)
         
         # Get top 3 with explanations
         suggestions = []
-        for i, task in enumerate(sorted_tasks[:3]):
+        for i, task in enumerate(top_tasks):
+            round_scores(task)
             explanation = generate_explanation(task, i + 1)
             suggestions.append({
                 'rank': i + 1,
@@ -79,43 +165,56 @@ def suggest_tasks(request):
                 'explanation': explanation
             })
         
-        return JsonResponse({
+        return _json_response({
             'suggestions': suggestions,
             'strategy': strategy
         })
         
-    except json.JSONDecodeError:
-        return JsonResponse({
+    except _PayloadTooLarge as e:
+        return _json_response({
+            'error': str(e)
+        }, status=413)
+    except orjson.JSONDecodeError:
+        return _json_response({
             'error': 'Invalid JSON format'
         }, status=400)
+    except TaskValidationError as e:
+        return _json_response({
+            'error': str(e)
+        }, status=400)
     except Exception as e:
-        return JsonResponse({
+        return _json_response({
             'error': str(e)
         }, status=500)
 
 
+def _score_and_round(scorer, tasks: list) -> list:
+    """Score, sort and round a batch for the analyze response."""
+    sorted_tasks = scorer.score_and_sort_tasks(tasks, validate=True)
+    for task in sorted_tasks:
+        round_scores(task)
+    return sorted_tasks
+
+
+def round_scores(task: dict) -> dict:
+    """Round a scored task's values for display (scoring keeps full precision)."""
+    task['priority_score'] = round(task['priority_score'], 2)
+    breakdown = task['score_breakdown']
+    for key in ('urgency', 'importance', 'effort', 'dependencies'):
+        breakdown[key] = round(breakdown[key], 1)
+    breakdown['final'] = round(breakdown['final'], 2)
+    return task
+
+
 def generate_explanation(task: dict, rank: int) -> str:
     """Generate human-readable explanation for why task was prioritized."""
     breakdown = task.get('score_breakdown', {})
     reasons = []
-    
-    # Check urgency
-    if breakdown.get('urgency', 0) > 85:
-        reasons.append("due very soon or overdue")
-    elif breakdown.get('urgency', 0) > 70:
-        reasons.append("approaching deadline")
-    
-    # Check importance
-    if breakdown.get('importance', 0) >= 80:
-        reasons.append("marked as highly important")
-    
-    # Check effort
-    if breakdown.get('effort', 0) > 80:
-        reasons.append("quick win (low effort)")
-    
-    # Check dependencies
-    if breakdown.get('dependencies', 0) > 50:
-        reasons.append("blocks other tasks")
+    explained = set()
+    for key, threshold, text in _REASON_TABLE:
+        if key not in explained and breakdown.get(key, 0) > threshold:
+            explained.add(key)
+            reasons.append(text)
     
     # Check for circular dependencies
     if task.get('has_circular_dependency'):
@@ -124,5 +223,8 @@ def generate_explanation(task: dict, rank: int) -> str:
     if not reasons:
         reasons.append("good balance of all factors")
     
+    # Upper-case only the first letter; str.capitalize() would also
+    # lower-case the rest of the sentence
     reason_text = ", ".join(reasons)
-    return f"Ranked #{rank}: {reason_text.capitalize()}. Score: {task['priority_score']}"
+    reason_text = reason_text[:1].upper() + reason_text[1:]
+    return f"Ranked #{rank}: {reason_text}. Score: {task['priority_score']}"